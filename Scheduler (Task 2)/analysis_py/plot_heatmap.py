@@ -1,5 +1,11 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+# Графики только сохраняются в PNG: берём Agg сразу, не перебирая GUI-бэкенды
+matplotlib.use("Agg", force=True)
+matplotlib.rcParams["figure.max_open_warning"] = 0
 import matplotlib.pyplot as plt
 from pathlib import Path
 
@@ -8,60 +14,89 @@ M_FIXED = 4
 THREADS_LIST = list(range(1, 13))
 N_LIST = list(range(100, 5001, 250))
 
+# Разрешение PNG; раскладку делает tight_layout(), bbox_inches="tight" не нужен
+SAVE_DPI = 120
+
+# Схема колонок CSV: pyarrow сразу парсит их в нужные типы
+CSV_COLUMN_TYPES = {
+    "threads": pa.int32(),
+    "M": pa.int32(),
+    "N": pa.int32(),
+    "avg_time_ms": pa.float64(),
+    "best_cost": pa.float64(),
+}
+
+# Колонки summary_heatmap.csv, которые реально нужны для графиков; остальные не парсим
+USED_COLUMNS = ["threads", "N", "avg_time_ms", "best_cost", "error"]
+
 
 def ensure_dirs(base_dir: Path):
     (base_dir / "figs").mkdir(parents=True, exist_ok=True)
 
 
+def read_csv_typed(p: Path, columns=None) -> pd.DataFrame:
+    """
+    Читает CSV через C-парсер pyarrow с типизацией колонок по CSV_COLUMN_TYPES.
+    Пустые строки (например, в error) считаются отсутствующими значениями.
+    Если задан columns — читаются только эти колонки.
+    """
+    table = pacsv.read_csv(
+        str(p),
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            strings_can_be_null=True,
+            include_columns=columns,
+        ),
+    )
+    return table.to_pandas()
+
+
 def load_heatmap_df(base_dir: Path) -> pd.DataFrame:
     p = base_dir / "data" / "summary_heatmap.csv"
     if not p.exists():
         raise FileNotFoundError(f"Не найден {p}. Сначала запусти run_heatmap_experiments.py")
-    df = pd.read_csv(p)
+    df = read_csv_typed(p, columns=USED_COLUMNS)
 
-    # Нормализация типов и отбор без ошибок
-    df["threads"] = pd.to_numeric(df["threads"], errors="coerce")
-    df["N"] = pd.to_numeric(df["N"], errors="coerce")
-    df["avg_time_ms"] = pd.to_numeric(df["avg_time_ms"], errors="coerce")
-    df["best_cost"] = pd.to_numeric(df["best_cost"], errors="coerce")
+    # Категории с фиксированным порядком ускоряют groupby и сразу дают
+    # упорядоченный результат
+    df["threads"] = pd.Categorical(df["threads"], categories=THREADS_LIST, ordered=True)
+    df["N"] = pd.Categorical(df["N"], categories=N_LIST, ordered=True)
 
+    # Отбор без ошибок
     df_ok = df[df["error"].isna()].copy()
     return df_ok
 
 
-def build_matrix(df_ok: pd.DataFrame, value_col: str) -> np.ndarray:
+def build_matrices(df_ok: pd.DataFrame):
     """
-    Строит матрицу Z размером [len(THREADS_LIST), len(N_LIST)],
-    где Z[i,j] = агрегированное значение (среднее/мин) для threads=THREADS_LIST[i], N=N_LIST[j].
+    Строит матрицы Z_time и Z_cost размером [len(THREADS_LIST), len(N_LIST)],
+    где Z[i,j] = агрегированное значение для threads=THREADS_LIST[i], N=N_LIST[j]:
+      - Z_time: avg_time_ms (среднее)
+      - Z_cost: best_cost   (минимум)
     Если данных нет — ставим NaN.
 
     Для нашего случая в summary_heatmap.csv каждая пара (thread, N) уже одна.
     Но на всякий случай возьмём mean/min так же, как делали раньше.
+    Обе матрицы строятся из одной группировки.
     """
-    # готовим словарь {(thr,N)->value}
     agg = (df_ok
-    .groupby(["threads", "N"], as_index=False)
-    .agg({
-        "avg_time_ms": "mean",
-        "best_cost": "min"
-    }))
-
-    # создадим матрицу
-    Z = np.full((len(THREADS_LIST), len(N_LIST)), np.nan, dtype=float)
-
-    for _, row in agg.iterrows():
-        thr = int(row["threads"])
-        N = int(row["N"])
-        if thr in THREADS_LIST and N in N_LIST:
-            i = THREADS_LIST.index(thr)
-            j = N_LIST.index(N)
-            if value_col == "avg_time_ms":
-                Z[i, j] = float(row["avg_time_ms"])
-            elif value_col == "best_cost":
-                Z[i, j] = float(row["best_cost"])
-            else:
-                raise ValueError(f"unknown value_col {value_col}")
-    return Z
+    .groupby(["threads", "N"], observed=True)
+    .agg(
+        avg_time_ms=("avg_time_ms", "mean"),
+        best_cost=("best_cost", "min")
+    ))
+
+    def to_matrix(col: str) -> np.ndarray:
+        # unstack раскладывает N по столбцам; reindex сам ставит NaN
+        # для отсутствующих пар (thr, N) и отбрасывает лишние
+        return (agg[col]
+                .unstack("N")
+                .reindex(index=THREADS_LIST, columns=N_LIST)
+                .to_numpy(dtype=float, na_value=np.nan))
+
+    Z_time = to_matrix("avg_time_ms")
+    Z_cost = to_matrix("best_cost")
+    return Z_time, Z_cost
 
 
 def plot_heatmap(Z: np.ndarray,
@@ -71,26 +106,26 @@ def plot_heatmap(Z: np.ndarray,
                  cbar_label: str,
                  out_path: Path):
     """
-    Рисует тепловую карту (imshow) для матрицы Z.
+    Рисует тепловую карту (pcolormesh) для матрицы Z.
     Ось X -> N, Ось Y -> threads.
     """
     plt.figure(figsize=(10, 5))
-    # aspect='auto' чтобы не растягивать квадраты до одинаковой стороны насильно.
-    im = plt.imshow(Z,
-                    aspect='auto',
-                    origin='lower',  # чтобы threads=1 был внизу графика
-                    interpolation='nearest')
+    # Ячейка (i, j) — квадрат [j, j+1] x [i, i+1]: строка 0 (threads=1)
+    # оказывается внизу графика, NaN-ячейки остаются пустыми
+    x_edges = np.arange(len(x_labels) + 1)
+    y_edges = np.arange(len(y_labels) + 1)
+    im = plt.pcolormesh(x_edges, y_edges, Z, shading='flat')
     plt.colorbar(im, label=cbar_label)
 
-    # подписи осей
-    plt.xticks(ticks=range(len(x_labels)), labels=[str(x) for x in x_labels], rotation=45, ha="right")
-    plt.yticks(ticks=range(len(y_labels)), labels=[str(y) for y in y_labels])
+    # подписи осей — по центрам ячеек
+    plt.xticks(ticks=np.arange(len(x_labels)) + 0.5, labels=[str(x) for x in x_labels], rotation=45, ha="right")
+    plt.yticks(ticks=np.arange(len(y_labels)) + 0.5, labels=[str(y) for y in y_labels])
 
     plt.xlabel("N (число задач)")
     plt.ylabel("threads (число потоков)")
     plt.title(title)
     plt.tight_layout()
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
+    plt.savefig(out_path, dpi=SAVE_DPI)
     plt.close()
 
 
@@ -100,10 +135,8 @@ def main():
 
     df_ok = load_heatmap_df(base_dir)
 
-    # Матрица времени
-    Z_time = build_matrix(df_ok, "avg_time_ms")
-    # Матрица качества
-    Z_cost = build_matrix(df_ok, "best_cost")
+    # Матрицы времени и качества
+    Z_time, Z_cost = build_matrices(df_ok)
 
     out_time = base_dir / "figs" / "heatmap_time.png"
     out_cost = base_dir / "figs" / "heatmap_quality.png"
@@ -1,30 +1,73 @@
 import math
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import matplotlib
+# Графики только сохраняются в PNG: берём Agg сразу, не перебирая GUI-бэкенды
+matplotlib.use("Agg", force=True)
+matplotlib.rcParams["figure.max_open_warning"] = 0
 import matplotlib.pyplot as plt
 from pathlib import Path
-from collections import defaultdict
 
 M_FIXED = 4
 N_LIST = [100, 500, 1000, 10000]        # используется для отбора данных из summary
 THREADS_SERIES = [0, 2, 4, 6, 12]       # 0 = seq baseline
 
+# Разрешение PNG; раскладку делает tight_layout(), bbox_inches="tight" не нужен
+SAVE_DPI = 120
+
+# Agg упрощает ломаные агрессивнее: меньше сегментов на отрисовку линий
+plt.rcParams["path.simplify_threshold"] = 1.0
+
+# Схема колонок CSV: pyarrow сразу парсит их в нужные типы
+CSV_COLUMN_TYPES = {
+    "threads": pa.int32(),
+    "M": pa.int32(),
+    "N": pa.int32(),
+    "avg_time_ms": pa.float64(),
+    "best_cost": pa.float64(),
+}
+
+# Колонки summary.csv, которые реально нужны для графиков; остальные не парсим
+USED_COLUMNS = ["threads", "M", "N", "avg_time_ms", "best_cost", "error"]
+
 
 def ensure_dirs(base_dir: Path):
     (base_dir / "figs").mkdir(parents=True, exist_ok=True)
 
 
+def read_csv_typed(p: Path, columns=None) -> pd.DataFrame:
+    """
+    Читает CSV через C-парсер pyarrow с типизацией колонок по CSV_COLUMN_TYPES.
+    Пустые строки (например, в error) считаются отсутствующими значениями.
+    Если задан columns — читаются только эти колонки.
+    """
+    table = pacsv.read_csv(
+        str(p),
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            strings_can_be_null=True,
+            include_columns=columns,
+        ),
+    )
+    return table.to_pandas()
+
+
 def load_summary(base_dir: Path) -> pd.DataFrame:
     p = base_dir / "data" / "summary.csv"
     if not p.exists():
         raise FileNotFoundError(f"Не найден {p}. Сначала запусти run_experiments.py")
-    df = pd.read_csv(p)
+    df = read_csv_typed(p, columns=USED_COLUMNS)
 
-    # Нормализация типов
-    df["threads"] = pd.to_numeric(df["threads"], errors="coerce").fillna(0).astype(int)
-    df["M"] = pd.to_numeric(df["M"], errors="coerce")
-    df["N"] = pd.to_numeric(df["N"], errors="coerce")
-    df["avg_time_ms"] = pd.to_numeric(df["avg_time_ms"], errors="coerce")
-    df["best_cost"] = pd.to_numeric(df["best_cost"], errors="coerce")
+    # Нормализация: пустой threads = 0 (seq baseline)
+    df["threads"] = df["threads"].fillna(0).astype(int)
+
+    # threads и N принимают единицы значений: категории с фиксированным
+    # порядком ускоряют groupby и сразу дают упорядоченный результат.
+    # Значения вне THREADS_SERIES / N_LIST становятся NaN и в графики не попадают
+    df["threads"] = pd.Categorical(df["threads"], categories=THREADS_SERIES, ordered=True)
+    df["N"] = pd.Categorical(df["N"], categories=N_LIST, ordered=True)
 
     return df
 
@@ -37,7 +80,7 @@ def compute_grouped(df_ok: pd.DataFrame) -> pd.DataFrame:
     """
     grp = (
         df_ok
-        .groupby(["threads", "N"], as_index=False)
+        .groupby(["threads", "N"], as_index=False, observed=True)
         .agg(
             avg_time_ms=("avg_time_ms", "mean"),
             best_cost=("best_cost", "min")
@@ -53,16 +96,12 @@ def add_quality_normalizations(grp: pd.DataFrame) -> pd.DataFrame:
       - excess_cost     = best_cost - best_overall(N)
       - rel_cost_pct    = 100 * best_cost / best_overall(N)
     """
-    best_per_N = (
-        grp
-        .groupby("N", as_index=False)
-        .agg(best_overall=("best_cost", "min"))
-    )
-
-    merged = pd.merge(grp, best_per_N, on="N", how="left")
-    merged["excess_cost"] = merged["best_cost"] - merged["best_overall"]
-    merged["rel_cost_pct"] = 100.0 * merged["best_cost"] / merged["best_overall"]
-    return merged
+    grp = grp.copy()
+    # transform("min") раздаёт минимум по N каждой строке без отдельного merge
+    grp["best_overall"] = grp.groupby("N", observed=True)["best_cost"].transform("min")
+    grp["excess_cost"] = grp["best_cost"] - grp["best_overall"]
+    grp["rel_cost_pct"] = 100.0 * grp["best_cost"] / grp["best_overall"]
+    return grp
 
 
 def _get_sorted_measured_Ns(grp_norm: pd.DataFrame):
@@ -73,7 +112,18 @@ def _get_sorted_measured_Ns(grp_norm: pd.DataFrame):
     return Ns_present
 
 
+def _save_and_clear(ax: plt.Axes, out_path: Path):
+    """
+    Сохраняет фигуру с осями ax в out_path и очищает оси для следующего графика.
+    """
+    fig = ax.figure
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=SAVE_DPI)
+    ax.clear()
+
+
 def _plot_line_generic(
+        ax: plt.Axes,
         grp_norm: pd.DataFrame,
         y_col: str,
         y_label: str,
@@ -93,7 +143,8 @@ def _plot_line_generic(
 
     Ns_present = _get_sorted_measured_Ns(grp_norm)
     x_positions = list(range(len(Ns_present)))  # равномерные точки
-    plt.figure(figsize=(8, 5))
+    n_to_x = {n_val: i for i, n_val in enumerate(Ns_present)}
+    ax.figure.set_size_inches(8, 5)
 
     for thr in THREADS_SERIES:
         sub = grp_norm[(grp_norm["threads"] == thr) &
@@ -105,44 +156,42 @@ def _plot_line_generic(
         sub = sub.sort_values("N")
 
         # сопоставляем каждой N её индекс на оси X
-        x_vals = [x_positions[Ns_present.index(n_val)] for n_val in sub["N"]]
+        x_vals = sub["N"].map(n_to_x).to_numpy()
         y_vals = sub[y_col].tolist()
 
         label = "seq" if thr == 0 else f"par-{thr}thr"
-        plt.plot(x_vals, y_vals, marker="o", label=label)
+        ax.plot(x_vals, y_vals, marker="o", label=label)
 
-    plt.xlabel("N (число работ)")
-    plt.ylabel(y_label)
-    plt.title(title)
+    ax.set_xlabel("N (число работ)")
+    ax.set_ylabel(y_label)
+    ax.set_title(title)
 
     # масштаб по Y
     if yscale == "log":
-        plt.yscale("log")
+        ax.set_yscale("log")
     elif yscale == "symlog":
         # внешний код для symlog обрабатывается в plot_line_cost_excess(),
         # здесь не используется
         pass
 
     # Сетка: только основные горизонтальные линии
-    plt.grid(axis="y", which="major", linestyle="--", alpha=0.4)
+    ax.grid(axis="y", which="major", linestyle="--", alpha=0.4)
 
     # Тики по X: равномерные позиции -> подписи реальными N
-    plt.xticks(x_positions, [str(n) for n in Ns_present])
+    ax.set_xticks(x_positions, [str(n) for n in Ns_present])
 
     # Кастомные настройки по Y, если переданы (например, лимиты или тики)
     if custom_y:
         if "yticks" in custom_y:
-            plt.yticks(custom_y["yticks"], custom_y.get("yticklabels", None))
+            ax.set_yticks(custom_y["yticks"], custom_y.get("yticklabels", None))
         if "ylim" in custom_y:
-            plt.ylim(custom_y["ylim"][0], custom_y["ylim"][1])
+            ax.set_ylim(custom_y["ylim"][0], custom_y["ylim"][1])
 
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
-    plt.close()
+    ax.legend()
+    _save_and_clear(ax, out_path)
 
 
-def plot_line_time(grp_norm: pd.DataFrame, base_dir: Path):
+def plot_line_time(ax: plt.Axes, grp_norm: pd.DataFrame, base_dir: Path):
     """
     Время исполнения:
     - Y логарифмическая (экспоненциальная шкала).
@@ -150,6 +199,7 @@ def plot_line_time(grp_norm: pd.DataFrame, base_dir: Path):
     """
     out_path = base_dir / "figs" / "line_time_cmp.png"
     _plot_line_generic(
+        ax=ax,
         grp_norm=grp_norm,
         y_col="avg_time_ms",
         y_label="avg_time_ms (мс)",
@@ -160,7 +210,7 @@ def plot_line_time(grp_norm: pd.DataFrame, base_dir: Path):
     )
 
 
-def plot_line_cost_absolute(grp_norm: pd.DataFrame, base_dir: Path):
+def plot_line_cost_absolute(ax: plt.Axes, grp_norm: pd.DataFrame, base_dir: Path):
     """
     Абсолютное качество (сумма времен завершения):
     - Y логарифмическая.
@@ -168,6 +218,7 @@ def plot_line_cost_absolute(grp_norm: pd.DataFrame, base_dir: Path):
     """
     out_path = base_dir / "figs" / "line_cost_cmp.png"
     _plot_line_generic(
+        ax=ax,
         grp_norm=grp_norm,
         y_col="best_cost",
         y_label="best_cost (сумма времен завершения)",
@@ -178,7 +229,7 @@ def plot_line_cost_absolute(grp_norm: pd.DataFrame, base_dir: Path):
     )
 
 
-def plot_line_cost_excess(grp_norm: pd.DataFrame, base_dir: Path):
+def plot_line_cost_excess(ax: plt.Axes, grp_norm: pd.DataFrame, base_dir: Path):
     """
     excess_cost = best_cost - best_overall(N)
 
@@ -211,17 +262,13 @@ def plot_line_cost_excess(grp_norm: pd.DataFrame, base_dir: Path):
     # Какие N реально присутствуют
     Ns_present = _get_sorted_measured_Ns(grp_norm)
     x_positions = list(range(len(Ns_present)))  # равномерные точки по X
+    n_to_x = {n_val: i for i, n_val in enumerate(Ns_present)}
 
-    plt.figure(figsize=(8, 5))
+    ax.figure.set_size_inches(8, 5)
 
     # Соберём все значения excess_cost, чтобы понять максимальный порядок
     all_excess_vals = []
 
-    def transform_excess(v: float) -> float:
-        if v <= 0:
-            return 0.0
-        return 1.0 + math.log10(v)
-
     # Рисуем линии
     for thr in THREADS_SERIES:
         sub = grp_norm[(grp_norm["threads"] == thr) &
@@ -230,31 +277,38 @@ def plot_line_cost_excess(grp_norm: pd.DataFrame, base_dir: Path):
             continue
 
         sub = sub.sort_values("N")
-        x_vals = [x_positions[Ns_present.index(n_val)] for n_val in sub["N"]]
+        x_vals = sub["N"].map(n_to_x).to_numpy()
 
-        y_orig = sub["excess_cost"].tolist()
-        y_plot = [transform_excess(v) for v in y_orig]
+        y_orig = sub["excess_cost"].to_numpy(dtype=float)
+        # transform(v) сразу для всей серии; под log10 подставляем 1.0
+        # вместо v <= 0, чтобы не получать предупреждений от NumPy
+        positive = y_orig > 0
+        y_plot = np.where(positive,
+                          1.0 + np.log10(np.where(positive, y_orig, 1.0)),
+                          0.0)
 
-        all_excess_vals.extend(y_orig)
+        all_excess_vals.append(y_orig)
 
         label = "seq" if thr == 0 else f"par-{thr}thr"
-        plt.plot(x_vals, y_plot, marker="o", label=label)
+        ax.plot(x_vals, y_plot, marker="o", label=label)
 
-    plt.xlabel("N (число работ)")
-    plt.ylabel("excess_cost = best_cost - best_overall(N)")
-    plt.title(f"Отрыв от лучшего решения (M={M_FIXED})")
+    ax.set_xlabel("N (число работ)")
+    ax.set_ylabel("excess_cost = best_cost - best_overall(N)")
+    ax.set_title(f"Отрыв от лучшего решения (M={M_FIXED})")
 
     # Горизонтальная сетка только по основным делениям
-    plt.grid(axis="y", which="major", linestyle="--", alpha=0.4)
+    ax.grid(axis="y", which="major", linestyle="--", alpha=0.4)
 
     # X-ось: равномерные позиции, подписи фактические N
-    plt.xticks(x_positions, [str(n) for n in Ns_present])
+    ax.set_xticks(x_positions, [str(n) for n in Ns_present])
 
     # --- Кастомные тики по Y ---
     # Определяем максимальный порядок величины excess_cost
-    positive_vals = [v for v in all_excess_vals if v is not None and v > 0]
-    if positive_vals:
-        max_excess = max(positive_vals)
+    excess_arr = (np.concatenate(all_excess_vals)
+                  if all_excess_vals else np.empty(0))
+    positive_vals = excess_arr[excess_arr > 0]
+    if positive_vals.size:
+        max_excess = float(np.nanmax(positive_vals))
     else:
         max_excess = 1.0
 
@@ -283,176 +337,153 @@ def plot_line_cost_excess(grp_norm: pd.DataFrame, base_dir: Path):
             else:
                 yticks_labels.append(f"1e{p}")  # "1e1", "1e2", ...
 
-    plt.yticks(yticks_vals, yticks_labels)
+    ax.set_yticks(yticks_vals, yticks_labels)
 
     # Немного поджать верхнюю границу
     ylim_top = (1.0 + max_pow) + 0.2
-    plt.ylim(0.0, ylim_top)
+    ax.set_ylim(0.0, ylim_top)
 
-    plt.legend()
-    plt.tight_layout()
+    ax.legend()
     out_path = base_dir / "figs" / "line_cost_excess_cmp.png"
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
-    plt.close()
+    _save_and_clear(ax, out_path)
 
 
 
-def plot_bar_cost_relative(grp_norm: pd.DataFrame, base_dir: Path):
+def plot_bar_cost_relative(ax: plt.Axes, grp_norm: pd.DataFrame, base_dir: Path):
     """
     rel_cost_pct = 100 * best_cost / best_overall(N).
     100% = лучшее найденное решение при данном N.
     Шкала Y ограничена [100%, max*1.05].
     Горизонтальная сетка только по основным делениям.
     """
-    rel_map = defaultdict(dict)
-    for _, row in grp_norm.iterrows():
-        N = int(row["N"])
-        thr = int(row["threads"])
-        rel_map[N][thr] = float(row["rel_cost_pct"])
+    # матрица rel_cost_pct[N, threads]; отсутствующие значения -> NaN
+    mat = (
+        grp_norm
+        .pivot(index="N", columns="threads", values="rel_cost_pct")
+        .reindex(columns=THREADS_SERIES)
+        .sort_index()
+    )
 
-    Ns_present = sorted(rel_map.keys())
+    Ns_present = [int(n) for n in mat.index]
     width = 0.15
-    x = range(len(Ns_present))
+    x = np.arange(len(Ns_present), dtype=float)
+    center = (len(THREADS_SERIES) - 1) / 2.0
 
-    all_vals = []
-    for N in Ns_present:
-        for thr in THREADS_SERIES:
-            if thr in rel_map[N]:
-                all_vals.append(rel_map[N][thr])
-
-    max_val = max(all_vals) if all_vals else 100.0
+    vals = mat.to_numpy(dtype=float)
+    max_val = np.nanmax(vals) if np.isfinite(vals).any() else 100.0
     ymax = max_val
     ymin = 100.0
 
-    plt.figure(figsize=(10, 5))
+    ax.figure.set_size_inches(10, 5)
     for i, thr in enumerate(THREADS_SERIES):
-        xs = [xi + (i - (len(THREADS_SERIES)-1)/2.0)*width for xi in x]
-        ys = []
-        for N in Ns_present:
-            ys.append(rel_map[N].get(thr, None))
+        xs = x + (i - center)*width
+        ys = mat[thr].to_numpy(dtype=float)
         label = "seq" if thr == 0 else f"par-{thr}thr"
-        plt.bar(xs, ys, width=width, label=label)
+        ax.bar(xs, ys, width=width, label=label)
 
-    plt.axhline(100.0, color="gray", linestyle="--", linewidth=1)
+    ax.axhline(100.0, color="gray", linestyle="--", linewidth=1)
 
-    plt.xticks(list(x), [str(n) for n in Ns_present])
-    plt.xlabel("N (число работ)")
-    plt.ylabel("rel_cost_pct = 100 * best_cost / best_overall(N)")
-    plt.title(f"Качество относительно лучшего найденного (M={M_FIXED}) — 100% лучшее")
+    ax.set_xticks(x, [str(n) for n in Ns_present])
+    ax.set_xlabel("N (число работ)")
+    ax.set_ylabel("rel_cost_pct = 100 * best_cost / best_overall(N)")
+    ax.set_title(f"Качество относительно лучшего найденного (M={M_FIXED}) — 100% лучшее")
 
-    plt.grid(axis="y", which="major", linestyle="--", alpha=0.4)
+    ax.grid(axis="y", which="major", linestyle="--", alpha=0.4)
 
-    plt.legend()
-    plt.ylim(ymin, ymax)
+    ax.legend()
+    ax.set_ylim(ymin, ymax)
 
     out_path = base_dir / "figs" / "bar_cost_rel_cmp.png"
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
-    plt.close()
+    _save_and_clear(ax, out_path)
 
 
-def bar_gain_plots(df_ok: pd.DataFrame, base_dir: Path):
+def bar_gain_plots(ax: plt.Axes, grp: pd.DataFrame, base_dir: Path):
     """
     bar_speed_gain.png, bar_quality_gain.png
 
     speed_gain_k(N)   = 100 * T_seq / T_par
     quality_gain_k(N) = 100 * C_seq / C_par
 
+    grp — уже агрегированные по (threads, N) значения из compute_grouped().
+
     Для bar_quality_gain шкала Y = [100%, max*1.05].
     Сетка: только основные горизонтальные линии.
     """
-    grp = (
-        df_ok
-        .groupby(["threads", "N"], as_index=False)
-        .agg(
-            avg_time_ms=("avg_time_ms", "mean"),
-            best_cost=("best_cost", "min")
-        )
-    )
-
-    time_by_thrN = defaultdict(dict)
-    cost_by_thrN = defaultdict(dict)
+    series_thr = [2, 4, 6, 12]
 
-    for _, row in grp.iterrows():
-        thr = int(row["threads"])
-        N = int(row["N"])
-        time_by_thrN[N][thr] = float(row["avg_time_ms"])
-        cost_by_thrN[N][thr] = float(row["best_cost"])
+    # матрицы [N, threads] (0 = seq); отсутствующие значения -> NaN
+    time_mat = (
+        grp
+        .pivot(index="N", columns="threads", values="avg_time_ms")
+        .reindex(columns=[0] + series_thr)
+        .sort_index()
+    )
+    cost_mat = (
+        grp
+        .pivot(index="N", columns="threads", values="best_cost")
+        .reindex(index=time_mat.index, columns=[0] + series_thr)
+    )
 
-    Ns_present = sorted(time_by_thrN.keys())
-    series_thr = [2, 4, 6, 12]
+    def gain_pct(mat: pd.DataFrame) -> np.ndarray:
+        """
+        100 * v_seq / v_par сразу для всех (N, thr), форма (len(N), len(series_thr));
+        0, если одного из значений нет или v_par <= 0.
+        """
+        v_seq = mat[[0]].to_numpy(dtype=float)         # (Ns, 1)
+        v_par = mat[series_thr].to_numpy(dtype=float)  # (Ns, len(series_thr))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain = 100.0 * v_seq / v_par
+        return np.where(np.isfinite(v_seq) & (v_par > 0), gain, 0.0)
+
+    speed_gains = gain_pct(time_mat)
+    quality_gains = gain_pct(cost_mat)
+
+    Ns_present = [int(n) for n in time_mat.index]
     width = 0.18
-    x = range(len(Ns_present))
+    x = np.arange(len(Ns_present), dtype=float)
+    center = (len(series_thr) - 1) / 2.0
 
     # --- bar_speed_gain.png ---
-    plt.figure(figsize=(10, 5))
+    ax.figure.set_size_inches(10, 5)
     for i, thr in enumerate(series_thr):
-        xs = [xi + (i - 1.5)*width for xi in x]
-        ys = []
-        for N in Ns_present:
-            t_seq = time_by_thrN[N].get(0, None)
-            t_par = time_by_thrN[N].get(thr, None)
-            if t_seq is None or t_par is None or t_par <= 0:
-                ys.append(0.0)
-            else:
-                ys.append(100.0 * t_seq / t_par)
-        plt.bar(xs, ys, width=width, label=f"par-{thr}thr")
+        xs = x + (i - center)*width
+        ax.bar(xs, speed_gains[:, i], width=width, label=f"par-{thr}thr")
 
-    plt.axhline(100.0, color="gray", linestyle="--", linewidth=1)
-    plt.xticks(list(x), [str(n) for n in Ns_present])
-    plt.xlabel("N (число работ)")
-    plt.ylabel("Speed gain, % = 100 * T_seq / T_par")
-    plt.title(f"Процентный относительный выигрыш по времени (M={M_FIXED})")
+    ax.axhline(100.0, color="gray", linestyle="--", linewidth=1)
+    ax.set_xticks(x, [str(n) for n in Ns_present])
+    ax.set_xlabel("N (число работ)")
+    ax.set_ylabel("Speed gain, % = 100 * T_seq / T_par")
+    ax.set_title(f"Процентный относительный выигрыш по времени (M={M_FIXED})")
 
-    plt.grid(axis="y", which="major", linestyle="--", alpha=0.4)
+    ax.grid(axis="y", which="major", linestyle="--", alpha=0.4)
 
-    plt.legend()
+    ax.legend()
     out_path = base_dir / "figs" / "bar_speed_gain.png"
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
-    plt.close()
+    _save_and_clear(ax, out_path)
 
     # --- bar_quality_gain.png ---
-    bars_data = []
-    all_vals_q = []
-
-    for i, thr in enumerate(series_thr):
-        xs = [xi + (i - 1.5)*width for xi in x]
-        ys = []
-        for N in Ns_present:
-            c_seq = cost_by_thrN[N].get(0, None)
-            c_par = cost_by_thrN[N].get(thr, None)
-            if c_seq is None or c_par is None or c_par <= 0:
-                val = 0.0
-            else:
-                val = 100.0 * c_seq / c_par
-            ys.append(val)
-            all_vals_q.append(val)
-        bars_data.append((xs, ys, f"par-{thr}thr"))
-
-    max_val_q = max(all_vals_q) if all_vals_q else 100.0
+    max_val_q = quality_gains.max() if quality_gains.size else 100.0
     ymax_q = max_val_q
     ymin_q = 100.0
 
-    plt.figure(figsize=(10, 5))
-    for xs, ys, label in bars_data:
-        plt.bar(xs, ys, width=width, label=label)
+    ax.figure.set_size_inches(10, 5)
+    for i, thr in enumerate(series_thr):
+        xs = x + (i - center)*width
+        ax.bar(xs, quality_gains[:, i], width=width, label=f"par-{thr}thr")
 
-    plt.axhline(100.0, color="gray", linestyle="--", linewidth=1)
-    plt.xticks(list(x), [str(n) for n in Ns_present])
-    plt.xlabel("N (число работ)")
-    plt.ylabel("Quality gain, % = 100 * C_seq / C_par")
-    plt.title(f"Процентный относительный прирост качества к seq (M={M_FIXED}) — выше 100% лучше")
+    ax.axhline(100.0, color="gray", linestyle="--", linewidth=1)
+    ax.set_xticks(x, [str(n) for n in Ns_present])
+    ax.set_xlabel("N (число работ)")
+    ax.set_ylabel("Quality gain, % = 100 * C_seq / C_par")
+    ax.set_title(f"Процентный относительный прирост качества к seq (M={M_FIXED}) — выше 100% лучше")
 
-    plt.grid(axis="y", which="major", linestyle="--", alpha=0.4)
+    ax.grid(axis="y", which="major", linestyle="--", alpha=0.4)
 
-    plt.legend()
-    plt.ylim(ymin_q, ymax_q)
+    ax.legend()
+    ax.set_ylim(ymin_q, ymax_q)
 
     out_path = base_dir / "figs" / "bar_quality_gain.png"
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=200, bbox_inches="tight")
-    plt.close()
+    _save_and_clear(ax, out_path)
 
 
 def main():
@@ -463,27 +494,33 @@ def main():
 
     # используем только валидные строки, нужные M и интересующие нас N_LIST;
     # далее фактические Ns_present получаем уже из данных
-    df_ok = df[
-        (df["error"].isna()) &
-        (df["M"] == M_FIXED) &
-        (df["N"].isin(N_LIST)) &
-        (df["avg_time_ms"].notna()) &
-        (df["best_cost"].notna())
-        ].copy()
+    # маску накапливаем in-place в одном буфере вместо пяти временных Series
+    mask = df["M"].to_numpy() == M_FIXED
+    mask &= df["N"].isin(N_LIST).to_numpy()
+    mask &= df["error"].isna().to_numpy()
+    mask &= df["avg_time_ms"].notna().to_numpy()
+    mask &= df["best_cost"].notna().to_numpy()
+    df_ok = df.iloc[mask].copy()
 
     grp = compute_grouped(df_ok)
     grp_norm = add_quality_normalizations(grp)
 
+    # Одна фигура на все графики: после сохранения оси очищаются и
+    # переиспользуются, размер выставляет каждая функция рисования
+    fig, ax = plt.subplots(figsize=(10, 5))
+
     # Линейные графики (равномерный X, кастомный Y)
-    plot_line_time(grp_norm, base_dir)
-    plot_line_cost_absolute(grp_norm, base_dir)
-    plot_line_cost_excess(grp_norm, base_dir)
+    plot_line_time(ax, grp_norm, base_dir)
+    plot_line_cost_absolute(ax, grp_norm, base_dir)
+    plot_line_cost_excess(ax, grp_norm, base_dir)
 
     # Гистограмма относительного качества к лучшему
-    plot_bar_cost_relative(grp_norm, base_dir)
+    plot_bar_cost_relative(ax, grp_norm, base_dir)
 
     # Гистограммы выигрыша относительно seq
-    bar_gain_plots(df_ok, base_dir)
+    bar_gain_plots(ax, grp, base_dir)
+
+    plt.close(fig)
 
     print("Сохранены графики в analysis_py/figs/:")
     print("  - line_time_cmp.png")
@@ -1,7 +1,11 @@
+import os
 import subprocess
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 # ------------------------------
@@ -48,6 +52,28 @@ SEED_BY_N = {
     10000: 4249999,
 }
 
+# Схема колонок CSV от research: pyarrow сразу парсит их в нужные типы
+CSV_COLUMN_TYPES = {
+    "M": pa.int32(),
+    "N": pa.int32(),
+    "avg_time_ms": pa.float64(),
+    "best_cost": pa.float64(),
+}
+
+
+def read_csv_typed(p: Path) -> pd.DataFrame:
+    """
+    Читает CSV через C-парсер pyarrow с типизацией колонок по CSV_COLUMN_TYPES.
+    """
+    table = pacsv.read_csv(
+        str(p),
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
 
 def ensure_dirs(base_dir: Path):
     (base_dir / "data").mkdir(parents=True, exist_ok=True)
@@ -107,7 +133,15 @@ def run_one(build_dir: Path, base_dir: Path, cfg: dict) -> pd.DataFrame:
         f.write("STDERR:\n" + res.stderr + "\n")
         f.write(f"RUNTIME_SEC: {t1 - t0}\n")
 
-    if res.returncode != 0 or not out_csv.exists():
+    # Сразу пробуем прочитать CSV: отдельная проверка exists() не нужна
+    df = None
+    if res.returncode == 0:
+        try:
+            df = read_csv_typed(out_csv)  # ожидается: M,N,avg_time_ms,best_cost
+        except FileNotFoundError:
+            pass
+
+    if df is None:
         err = f"rc={res.returncode}, csv_exists={out_csv.exists()}"
         print(f"[run] {exp_name}: ERROR {err}")
         return pd.DataFrame([{
@@ -121,7 +155,6 @@ def run_one(build_dir: Path, base_dir: Path, cfg: dict) -> pd.DataFrame:
             "error": err,
         }])
 
-    df = pd.read_csv(out_csv)  # ожидается: M,N,avg_time_ms,best_cost
     df["mode"] = cfg["mode"]
     df["threads"] = cfg.get("threads", None)
     df["runs"] = cfg["runs"]
@@ -169,9 +202,14 @@ def main():
                 "hard_limit": hard_limit
             })
 
-    dfs = []
-    for cfg in experiments:
-        dfs.append(run_one(build_dir, base_dir, cfg))
+    # Запуски независимы, поэтому гоняем их параллельно, но так, чтобы
+    # workers * threads не превышало число ядер (иначе замеры времени поплывут)
+    max_workers = max(1, (os.cpu_count() or 1) // max(THREADS_LIST))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [ex.submit(run_one, build_dir, base_dir, cfg)
+                   for cfg in experiments]
+        dfs = [f.result() for f in futures]
 
     df_all = pd.concat(dfs, ignore_index=True)
     # Нормализуем threads: для seq проставим 0
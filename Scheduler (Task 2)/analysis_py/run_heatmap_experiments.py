@@ -1,7 +1,11 @@
+import os
 import subprocess
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 # ------------------------------
@@ -27,26 +31,41 @@ MAX_NO_IMPROVE = 200
 OUTER_NO_IMPROVE = 5
 RUNS = 1  # один прогон на конфигурацию для ускорения
 
-# Лимит итераций: чуть растёт с N
-def hard_limit_for(N: int) -> int:
-    """
-    Эмпирически: чем больше N, тем выше бюджет.
-    Можно линейно накинуть, чтобы не было слишком слабого поиска.
-    """
-    if N <= 500:
-        return 200_000
-    elif N <= 2000:
-        return 400_000
-    else:
-        return 800_000
+# Столбцы сводного summary_heatmap.csv
+SUMMARY_COLS = ["threads", "N", "avg_time_ms", "best_cost", "error"]
+
+# Схема колонок CSV от research: pyarrow сразу парсит их в нужные типы
+CSV_COLUMN_TYPES = {
+    "M": pa.int32(),
+    "N": pa.int32(),
+    "avg_time_ms": pa.float64(),
+    "best_cost": pa.float64(),
+}
 
+# Лимит итераций: чуть растёт с N.
+# Эмпирически: чем больше N, тем выше бюджет, чтобы не было слишком слабого поиска
+HARD_LIMIT_BY_N = {
+    N: (200_000 if N <= 500 else 400_000 if N <= 2000 else 800_000)
+    for N in N_LIST
+}
 
-def seed_for(N: int) -> int:
+# Сид детерминируем только от N.
+# Так все варианты threads для одного N будут решать тот же инстанс
+SEED_BY_N = {N: 900000 + N for N in N_LIST}
+
+
+def read_csv_typed(p: Path) -> pd.DataFrame:
     """
-    Сид детерминируем только от N.
-    Так все варианты threads для одного N будут решать тот же инстанс.
+    Читает CSV через C-парсер pyarrow с типизацией колонок по CSV_COLUMN_TYPES.
     """
-    return 900000 + N
+    table = pacsv.read_csv(
+        str(p),
+        convert_options=pacsv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
 
 
 def ensure_dirs(base_dir: Path):
@@ -91,12 +110,12 @@ def run_single(build_dir: Path,
                threads: int) -> pd.DataFrame:
     """
     Запускает один эксперимент (threads, N).
-    Возвращает DataFrame одной строки с колонками:
-        threads, N, avg_time_ms, best_cost
-    или с error, если не получилось.
+    Возвращает DataFrame (ожидается одна строка) с колонками SUMMARY_COLS:
+        threads, N, avg_time_ms, best_cost, error
+    где error != None, если не получилось.
     """
-    seed = seed_for(N)
-    hard_limit = hard_limit_for(N)
+    seed = SEED_BY_N[N]
+    hard_limit = HARD_LIMIT_BY_N[N]
 
     exp_name = f"heat_thr{threads}_N{N}"
     out_csv = base_dir / "data" / f"{exp_name}.csv"
@@ -121,7 +140,15 @@ def run_single(build_dir: Path,
         f.write("STDERR:\n" + res.stderr + "\n")
         f.write(f"RUNTIME_SEC: {t1 - t0}\n")
 
-    if res.returncode != 0 or not out_csv.exists():
+    # Сразу пробуем прочитать CSV: отдельная проверка exists() не нужна
+    df_local = None
+    if res.returncode == 0:
+        try:
+            df_local = read_csv_typed(out_csv)
+        except FileNotFoundError:
+            pass
+
+    if df_local is None:
         err = f"rc={res.returncode}, csv_exists={out_csv.exists()}"
         print(f"[run] {exp_name}: ERROR {err}")
         return pd.DataFrame([{
@@ -133,27 +160,14 @@ def run_single(build_dir: Path,
         }])
 
     # research вывел CSV формата: M,N,avg_time_ms,best_cost
-    df_local = pd.read_csv(out_csv)
-    # Ожидаем ровно одну строку, но если нет — усредним вручную
-    # (например, runs=1 -> одна строка)
     df_local["threads"] = threads
     df_local["error"] = None
 
-    # Оставим нужные столбцы: threads, N, avg_time_ms, best_cost, error
-    cols = ["threads", "N", "avg_time_ms", "best_cost", "error"]
-    # Найдём среднее/минимум на случай, если csv вдруг несёт несколько N (не должен)
-    df_out = (df_local
-    .groupby(["threads", "N"], as_index=False)
-    .agg({
-        "avg_time_ms": "mean",
-        "best_cost": "min",
-        "error": "min"
-    }))
-    # Убедимся, что есть все нужные колонки
-    for c in cols:
-        if c not in df_out.columns:
-            df_out[c] = None
-    return df_out[cols]
+    # Оставим нужные столбцы: threads, N, avg_time_ms, best_cost, error.
+    # Агрегация (на случай, если csv вдруг несёт несколько строк) делается
+    # один раз в main() по общему DataFrame.
+    # reindex добавит недостающие колонки как пустые
+    return df_local.reindex(columns=SUMMARY_COLS)
 
 
 def main():
@@ -162,14 +176,27 @@ def main():
 
     ensure_dirs(base_dir)
 
-    frames = []
-
-    for threads in THREADS_LIST:
-        for N in N_LIST:
-            df_entry = run_single(build_dir, base_dir, M_FIXED, N, threads)
-            frames.append(df_entry)
-
-    df_all = pd.concat(frames, ignore_index=True)
+    # Запуски независимы, поэтому гоняем их параллельно, но так, чтобы
+    # workers * threads не превышало число ядер (иначе замеры времени поплывут)
+    max_workers = max(1, (os.cpu_count() or 1) // max(THREADS_LIST))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [
+            ex.submit(run_single, build_dir, base_dir, M_FIXED, N, threads)
+            for threads in THREADS_LIST
+            for N in N_LIST
+        ]
+        frames = [f.result() for f in futures]
+
+    # Найдём среднее/минимум на случай, если csv вдруг несёт несколько строк
+    # на одну пару (threads, N) (не должен)
+    df_all = (pd.concat(frames, ignore_index=True)
+    .groupby(["threads", "N"], as_index=False)
+    .agg(
+        avg_time_ms=("avg_time_ms", "mean"),
+        best_cost=("best_cost", "min"),
+        error=("error", "min")
+    ))
 
     # Сохраняем общий сводный файл
     summary_path = base_dir / "data" / "summary_heatmap.csv"